@@ -11,7 +11,7 @@ Usage:
 """
 
 import json
-import shutil
+import os
 import sys
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
@@ -53,9 +53,9 @@ if CONFIG_FILE.exists():
         CATEGORY_NAMES.append(v.get("display_name_zh") or v.get("display_name") or "")
 
 
-def get_date_files(directory: Path, pattern: str = "*.md") -> list[tuple[str, Path]]:
+def get_date_files(directory: Path, pattern: str = "*.md", prefix: str = "") -> list[tuple[str, Path]]:
     results = []
-    for f in directory.glob(pattern):
+    for f in directory.glob(prefix + pattern):
         try:
             datetime.strptime(f.stem, "%Y-%m-%d")
             results.append((f.stem, f))
@@ -64,82 +64,169 @@ def get_date_files(directory: Path, pattern: str = "*.md") -> list[tuple[str, Pa
     return sorted(results)
 
 
-def generate_monthly_summary(year: int, month: int):
+def existing_categories() -> list[str]:
+    """CATEGORY_NAMES whose directory exists under NEURONS_DIR.
+
+    One listing of NEURONS_DIR covers plain names; display names containing
+    a path separator are nested directories and are probed individually.
+    """
+    try:
+        with os.scandir(NEURONS_DIR) as it:
+            children = {e.name for e in it if e.is_dir()}
+    except FileNotFoundError:
+        return []
+    seps = tuple(filter(None, (os.sep, os.altsep)))
+    return [
+        name for name in CATEGORY_NAMES
+        if name in children
+        or (any(sep in name for sep in seps) and (NEURONS_DIR / name).is_dir())
+    ]
+
+
+def dedup_head(items, n: int) -> list:
+    """Return the first n unique items, in order, without scanning past them."""
+    seen = set()
+    out = []
+    for item in items:
+        if item in seen:
+            continue
+        seen.add(item)
+        out.append(item)
+        if len(out) == n:
+            break
+    return out
+
+
+def archive_cutoff() -> str:
+    """Newest date (YYYY-MM-DD) old enough to archive.
+
+    ISO dates sort as strings, so callers test ``date_str <= cutoff``; a
+    file's local midnight falls before the cutoff instant on that day too.
+    """
+    return (datetime.now(LOCAL_TZ) - timedelta(days=ARCHIVE_DAYS)).strftime("%Y-%m-%d")
+
+
+def sweep_category(cat_dir: Path, month_str: str | None, cutoff_str: str | None) -> tuple[list[str], list[Path]]:
+    """Walk one category directory for both the monthly summary and archival.
+
+    Returns the first 15 unique summary lines from files dated in month_str and
+    the files dated on or before cutoff_str. Pass None to skip either side.
+    """
+    month_files = []
+    stale_paths = []
+    with os.scandir(cat_dir) as it:
+        for e in it:
+            if not e.name.endswith(".md"):
+                continue
+            date_str = e.name[:-3]
+            in_month = month_str is not None and date_str.startswith(month_str)
+            is_stale = cutoff_str is not None and date_str <= cutoff_str
+            if not (in_month or is_stale):
+                continue
+            try:
+                datetime.strptime(date_str, "%Y-%m-%d")
+            except ValueError:
+                continue
+            path = Path(e.path)
+            if in_month:
+                month_files.append((date_str, path))
+            if is_stale:
+                stale_paths.append(path)
+
+    # Lazy, so files past the 15th unique line are never read
+    candidates = (ls for _, filepath in sorted(month_files)
+                  for l in filepath.read_text(encoding="utf-8").split("\n")
+                  if (ls := l.strip()).startswith(("- ", "## ")))
+    return dedup_head(candidates, 15), stale_paths
+
+
+def sweep_categories(month_str: str | None, cutoff_str: str | None) -> dict[str, tuple[list[str], list[Path]]]:
+    return {
+        cat_name: sweep_category(NEURONS_DIR / cat_name, month_str, cutoff_str)
+        for cat_name in existing_categories()
+    }
+
+
+def generate_monthly_summary(year: int, month: int, sweeps: dict | None = None):
     MONTHLY_DIR.mkdir(parents=True, exist_ok=True)
     month_str = f"{year}-{month:02d}"
     summary_file = MONTHLY_DIR / f"{month_str}.md"
 
-    lines = [f"# Monthly Summary: {month_str}", ""]
+    # Stream into a temp file so a failed read never clobbers an existing summary
+    tmp_file = MONTHLY_DIR / f".{month_str}.md.tmp"
+    try:
+        with tmp_file.open("w", encoding="utf-8", buffering=1 << 16) as out:
+            emit = out.write
+            emit(f"# Monthly Summary: {month_str}\n\n")
 
-    # Daily memories
-    lines.append("## 📝 Daily Highlights")
-    daily_count = 0
-    for date_str, filepath in get_date_files(MEMORY_DIR):
-        if date_str.startswith(month_str):
-            content = filepath.read_text(encoding="utf-8")
-            key_lines = [l.strip() for l in content.split("\n")
-                        if l.strip().startswith("## ") or l.strip().startswith("- ⭐") or l.strip().startswith("- **")]
-            if key_lines:
-                lines.append(f"\n### {date_str}")
-                lines.extend(key_lines[:10])
-                daily_count += 1
-    lines.append(f"\n*{daily_count} days*")
-
-    # Dimension categories
-    lines.append("\n## 🧠 Dimension Summary")
-    for cat_name in CATEGORY_NAMES:
-        cat_dir = NEURONS_DIR / cat_name
-        if not cat_dir.exists():
-            continue
-        entries = []
-        for date_str, filepath in get_date_files(cat_dir):
-            if date_str.startswith(month_str):
+            # Daily memories
+            emit("## 📝 Daily Highlights\n")
+            daily_count = 0
+            for date_str, filepath in get_date_files(MEMORY_DIR, prefix=month_str):
                 content = filepath.read_text(encoding="utf-8")
-                entries.extend(l.strip() for l in content.split("\n")
-                             if l.strip().startswith("- ") or l.strip().startswith("## "))
-        if entries:
-            lines.append(f"\n### {cat_name}")
-            lines.extend(list(dict.fromkeys(entries))[:15])
-
-    # Session highlights
-    lines.append("\n## 💬 Chat Highlights")
-    for date_str, filepath in get_date_files(DIGEST_DIR):
-        if date_str.startswith(month_str):
-            content = filepath.read_text(encoding="utf-8")
-            for line in content.split("\n"):
-                if line.startswith("### ") and "💬" in line:
-                    lines.append(f"- {date_str}: {line.lstrip('# ')}")
+                key_lines = []
+                for l in content.split("\n"):
+                    if (ls := l.strip()).startswith(("## ", "- ⭐", "- **")):
+                        key_lines.append(ls)
+                        if len(key_lines) == 10:
+                            break
+                if key_lines:
+                    emit(f"\n### {date_str}\n")
+                    for line in key_lines:
+                        emit(line)
+                        emit("\n")
+                    daily_count += 1
+            emit(f"\n*{daily_count} days*\n")
+
+            # Dimension categories
+            emit("\n## 🧠 Dimension Summary\n")
+            if sweeps is None:
+                sweeps = sweep_categories(month_str, None)
+            for cat_name, (entries, _) in sweeps.items():
+                if entries:
+                    emit(f"\n### {cat_name}\n")
+                    for line in entries:
+                        emit(line)
+                        emit("\n")
+
+            # Session highlights
+            emit("\n## 💬 Chat Highlights\n")
+            for date_str, filepath in get_date_files(DIGEST_DIR, prefix=month_str):
+                content = filepath.read_text(encoding="utf-8")
+                for line in content.split("\n"):
+                    if line.startswith("### ") and "💬" in line:
+                        emit(f"- {date_str}: {line.lstrip('# ')}\n")
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
+    tmp_file.replace(summary_file)
 
-    summary_file.write_text("\n".join(lines), encoding="utf-8")
     print(f"📊 Monthly summary: {summary_file}")
 
 
-def archive_old_files():
+def archive_old_files(sweeps: dict | None = None):
     ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
-    now = datetime.now(LOCAL_TZ)
-    cutoff = now - timedelta(days=ARCHIVE_DAYS)
+    cutoff_str = archive_cutoff()
     count = 0
 
     for date_str, filepath in get_date_files(MEMORY_DIR):
-        if datetime.strptime(date_str, "%Y-%m-%d").replace(tzinfo=LOCAL_TZ) < cutoff:
-            shutil.move(str(filepath), str(ARCHIVE_DIR / filepath.name))
+        if date_str <= cutoff_str:
+            filepath.replace(ARCHIVE_DIR / filepath.name)
             count += 1
             print(f"📦 Archived: {filepath.name}")
 
     for date_str, filepath in get_date_files(DIGEST_DIR):
-        if datetime.strptime(date_str, "%Y-%m-%d").replace(tzinfo=LOCAL_TZ) < cutoff:
-            shutil.move(str(filepath), str(ARCHIVE_DIR / f"digest-{filepath.name}"))
+        if date_str <= cutoff_str:
+            filepath.replace(ARCHIVE_DIR / f"digest-{filepath.name}")
             count += 1
 
     # Clean old neuron daily files
-    for cat_name in CATEGORY_NAMES:
-        cat_dir = NEURONS_DIR / cat_name
-        if not cat_dir.exists():
-            continue
-        for date_str, filepath in get_date_files(cat_dir):
-            if datetime.strptime(date_str, "%Y-%m-%d").replace(tzinfo=LOCAL_TZ) < cutoff:
-                filepath.unlink()
-                count += 1
+    if sweeps is None:
+        sweeps = sweep_categories(None, cutoff_str)
+    for _, stale_paths in sweeps.values():
+        for filepath in stale_paths:
+            filepath.unlink()
+            count += 1
 
     print(f"{'✅ Archived ' + str(count) + ' files' if count else '📭 Nothing to archive'}")
 
@@ -151,8 +238,10 @@ def run_monthly():
 
     print(f"🌙 Forgetting Curve — {now.strftime('%Y-%m-%d %H:%M')}")
     print("=" * 50)
-    generate_monthly_summary(last_year, last_month)
-    archive_old_files()
+    # One walk per category feeds both the summary and the cleanup
+    sweeps = sweep_categories(f"{last_year}-{last_month:02d}", archive_cutoff())
+    generate_monthly_summary(last_year, last_month, sweeps)
+    archive_old_files(sweeps)
     print("=" * 50)
     print("✨ Done")
 
@@ -11,9 +11,15 @@ Usage:
 import json
 import sys
 from collections import defaultdict
+from itertools import chain
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 SCRIPT_DIR = Path(__file__).resolve().parent
 BRAIN_DIR = SCRIPT_DIR.parent
 WORKSPACE_DIR = BRAIN_DIR.parent
@@ -51,6 +57,45 @@ def load_categories() -> dict:
 
 CATEGORIES, DEFAULT_CATEGORY = load_categories()
 
+# (category, patterns, indicators) with keywords lowercased once at load
+_CAT_TABLE: tuple[tuple[str, tuple[str, ...], tuple[str, ...]], ...] = tuple(
+    (cat_key,
+     tuple(p.lower() for p in rules.get("patterns", [])),
+     tuple(i.lower() for i in rules.get("indicators", [])))
+    for cat_key, rules in CATEGORIES.items()
+)
+
+
+def build_automaton():
+    """Build one Aho-Corasick automaton over every pattern and indicator.
+
+    Each keyword maps to its (order, category, weight) hits, where order is
+    its position in the original per-category scan so ties still resolve
+    the same way. Empty keywords can't go in the automaton but match every
+    entry (as `"" in content` does), so their hits are returned separately.
+    Returns (None, ()) if pyahocorasick is not installed.
+    """
+    if ahocorasick is None:
+        return None, ()
+    hits = defaultdict(list)
+    order = 0
+    for cat_key, patterns, indicators in _CAT_TABLE:
+        for words, weight in ((patterns, 2), (indicators, 1)):
+            for word in words:
+                hits[word].append((order, cat_key, weight))
+                order += 1
+    always = tuple(hits.pop("", ()))
+    if not hits:
+        return None, ()
+    automaton = ahocorasick.Automaton()
+    for word, targets in hits.items():
+        automaton.add_word(word, tuple(targets))
+    automaton.make_automaton()
+    return automaton, always
+
+
+_AUTOMATON, _ALWAYS_HITS = build_automaton()
+
 
 def parse_daily_memory(date_str: str) -> list[dict]:
     memory_file = MEMORY_DIR / f"{date_str}.md"
@@ -61,25 +106,37 @@ def parse_daily_memory(date_str: str) -> list[dict]:
     entries = []
     for line in content.split("\n"):
         line = line.strip()
-        if line.startswith("## ") or (line.startswith("- ") and len(line) > 5):
-            entries.append({
-                "content": line.lstrip("#- ").strip(),
-                "raw": line,
-            })
+        if line.startswith("## "):
+            text = line[3:].strip()
+        elif line.startswith("- ") and len(line) > 5:
+            text = line[2:].strip()
+        else:
+            continue
+        entries.append({
+            "content": text,
+            "content_lower": text.lower(),
+            "raw": line,
+        })
     return entries
 
 
 def classify_entry(entry: dict) -> str:
-    content = entry["content"].lower()
+    content = entry["content_lower"]
     scores = defaultdict(int)
 
-    for cat_key, rules in CATEGORIES.items():
-        for pattern in rules.get("patterns", []):
-            if pattern.lower() in content:
-                scores[cat_key] += 2
-        for indicator in rules.get("indicators", []):
-            if indicator.lower() in content:
-                scores[cat_key] += 1
+    if _AUTOMATON is not None:
+        # Each keyword scores once however often it occurs, like `in` below
+        matched = {targets for _, targets in _AUTOMATON.iter(content)}
+        for _, cat_key, weight in sorted(chain(_ALWAYS_HITS, *matched)):
+            scores[cat_key] += weight
+    else:
+        for cat_key, patterns, indicators in _CAT_TABLE:
+            for pattern in patterns:
+                if pattern in content:
+                    scores[cat_key] += 2
+            for indicator in indicators:
+                if indicator in content:
+                    scores[cat_key] += 1
 
     if not scores:
         return DEFAULT_CATEGORY
@@ -110,10 +167,9 @@ def consolidate(date_str: str):
             existing = [l for l in target_file.read_text(encoding="utf-8").split("\n") if l.strip()]
 
         all_content = existing + [item["raw"] for item in items]
-        unique = list(dict.fromkeys(all_content))
 
         header = f"# {date_str} Memory Consolidation\n\n"
-        target_file.write_text(header + "\n".join(unique), encoding="utf-8")
+        target_file.write_text(header + "\n".join(dict.fromkeys(all_content)), encoding="utf-8")
         print(f"📝 {folder_name}: {len(items)} entries → {target_file.name}")
 
     print(f"✅ {date_str}: Consolidated {len(entries)} entries")
@@ -12,9 +12,15 @@ import json
 import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+try:
+    from orjson import loads as _jloads
+except ImportError:
+    from json import loads as _jloads
+
 # Resolve paths relative to this script's location
 SCRIPT_DIR = Path(__file__).resolve().parent
 BRAIN_DIR = SCRIPT_DIR.parent
@@ -41,6 +47,20 @@ if CONFIG_FILE.exists():
 else:
     LOCAL_TZ = timezone.utc
 
+_CRON_NAME_RE = re.compile(r"\[cron:\S+\s+(.+?)\]")
+_CRON_TAG_RE = re.compile(r"\[cron:\S+\s+.+?\]\s*")
+
+# Parsed ISO timestamps, keyed by the raw string from the JSONL record
+_TS_CACHE: dict[str, datetime] = {}
+_TS_CACHE_MAX = 50_000
+
+# How many records scan_session_header reads before handing a heartbeat
+# session to the full parse
+_HEADER_SCAN_LINES = 200
+
+# Below this many candidate files, process start-up costs more than it saves
+_PARALLEL_MIN_FILES = 16
+
 
 def parse_session(jsonl_path: Path) -> dict:
     """Parse a single JSONL session file."""
@@ -50,14 +70,15 @@ def parse_session(jsonl_path: Path) -> dict:
         "is_cron": False, "cron_name": "",
     }
 
-    with jsonl_path.open("r", encoding="utf-8") as f:
+    with jsonl_path.open("rb", buffering=1 << 20) as f:
         for line in f:
-            line = line.strip()
-            if not line:
+            # Records are single-line JSON objects; the parser takes the raw
+            # UTF-8 bytes and tolerates surrounding whitespace, so skip anything
+            # else without stripping or decoding.
+            if not _is_record(line):
                 continue
-            try:
-                obj = json.loads(line)
-            except json.JSONDecodeError:
+            obj = _load_record(line)
+            if obj is None:
                 continue
 
             obj_type = obj.get("type", "")
@@ -65,7 +86,7 @@ def parse_session(jsonl_path: Path) -> dict:
 
             if timestamp:
                 try:
-                    ts = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+                    ts = _parse_ts(timestamp)
                     if session["start_time"] is None:
                         session["start_time"] = ts
                     session["end_time"] = ts
@@ -83,7 +104,7 @@ def parse_session(jsonl_path: Path) -> dict:
                 if text:
                     if role == "user" and "[cron:" in text:
                         session["is_cron"] = True
-                        m = re.search(r"\[cron:\S+\s+(.+?)\]", text)
+                        m = _CRON_NAME_RE.search(text)
                         if m:
                             session["cron_name"] = m.group(1)
                     session["messages"].append({
@@ -97,6 +118,99 @@ def parse_session(jsonl_path: Path) -> dict:
     return session
 
 
+def scan_session_header(jsonl_path: Path) -> tuple[bool, datetime | None, bool]:
+    """Cheaply read the head of a session file without building a transcript.
+
+    Returns (is_heartbeat, start_time, substantive_hint). Reading stops as soon
+    as the first user message shows the session is not a heartbeat cron, or a
+    substantive assistant reply turns up. A heartbeat is only reported as noise
+    when the whole file has been read without such a reply; past
+    _HEADER_SCAN_LINES records the full parse decides.
+    """
+    is_heartbeat = False
+    start_time = None
+    user_seen = False
+
+    with jsonl_path.open("rb") as f:
+        for n, line in enumerate(f):
+            if n >= _HEADER_SCAN_LINES:
+                # Long heartbeats usually did real work; let the full parse decide
+                return is_heartbeat, start_time, True
+            if not _is_record(line):
+                continue
+            obj = _load_record(line)
+            if obj is None:
+                continue
+
+            if start_time is None and obj.get("timestamp"):
+                try:
+                    start_time = _parse_ts(obj["timestamp"])
+                except ValueError:
+                    pass
+
+            if obj.get("type") != "message":
+                continue
+            msg = obj.get("message", {})
+            role = msg.get("role", "")
+            text = _extract_text(msg.get("content", ""))
+            if not text:
+                continue
+
+            if role == "user":
+                if user_seen:
+                    # A follow-up prompt; let the full parse decide
+                    return is_heartbeat, start_time, True
+                user_seen = True
+                m = _CRON_NAME_RE.search(text) if "[cron:" in text else None
+                is_heartbeat = m is not None and "heartbeat" in m.group(1).lower()
+                if not is_heartbeat:
+                    return False, start_time, True
+            elif _is_substantive(role, text):
+                return is_heartbeat, start_time, True
+
+    return is_heartbeat, start_time, not is_heartbeat
+
+
+def _is_record(line: bytes) -> bool:
+    # Only lines that don't open with "{" outright pay for an lstrip()
+    return line.startswith(b"{") or line.lstrip().startswith(b"{")
+
+
+def _load_record(line: bytes) -> dict | None:
+    try:
+        return _jloads(line)
+    except ValueError:
+        if _jloads is json.loads:
+            return None
+    # orjson rejects JSON the stdlib accepts, e.g. lone surrogate escapes
+    # from a string cut mid-emoji, or NaN/Infinity
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+
+def _is_substantive(role: str, text: str) -> bool:
+    return (
+        role == "assistant"
+        and text not in ("HEARTBEAT_OK", "NO_REPLY", "")
+        and not text.startswith("<")
+    )
+
+
+def _parse_ts(timestamp: str) -> datetime:
+    ts = _TS_CACHE.get(timestamp)
+    if ts is None:
+        if timestamp.endswith("Z"):
+            ts = datetime.fromisoformat(timestamp[:-1] + "+00:00")
+        else:
+            ts = datetime.fromisoformat(timestamp)
+        if len(_TS_CACHE) >= _TS_CACHE_MAX:
+            _TS_CACHE.clear()
+        _TS_CACHE[timestamp] = ts
+    return ts
+
+
 def _extract_text(content) -> str:
     if isinstance(content, str):
         return content.strip()
@@ -124,7 +238,8 @@ def generate_digest(session: dict) -> str:
         text = msg["text"]
         if len(text) > 500:
             text = text[:500] + "…"
-        text = re.sub(r"\[cron:\S+\s+.+?\]\s*", "", text)
+        if "[cron:" in text:
+            text = _CRON_TAG_RE.sub("", text)
 
         if msg["role"] == "user":
             lines.append(f"**👤 User**: {text}")
@@ -135,18 +250,55 @@ def generate_digest(session: dict) -> str:
     return "\n".join(lines)
 
 
+def _scan_session_files():
+    """Yield DirEntry objects for the *.jsonl files in SESSIONS_DIR."""
+    try:
+        it = os.scandir(SESSIONS_DIR)
+    except FileNotFoundError:
+        return
+    with it:
+        for entry in it:
+            if entry.name.endswith(".jsonl") and entry.is_file():
+                yield entry
+
+
+def _parse_sessions(paths: list[Path]) -> list[dict]:
+    """Parse session files, spreading larger batches across worker processes."""
+    if len(paths) < _PARALLEL_MIN_FILES:
+        return [parse_session(p) for p in paths]
+    # Fork starts every worker up front, so never spawn more than there are files
+    workers = min(os.cpu_count() or 1, len(paths))
+    chunksize = max(1, len(paths) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(parse_session, paths, chunksize=chunksize))
+
+
 def process_date(target_date: str):
     target = datetime.strptime(target_date, "%Y-%m-%d").replace(tzinfo=LOCAL_TZ)
     target_start_utc = target.replace(hour=0, minute=0, second=0).astimezone(timezone.utc)
     target_end_utc = target.replace(hour=23, minute=59, second=59).astimezone(timezone.utc)
 
-    sessions = []
-    for f in SESSIONS_DIR.glob("*.jsonl"):
-        mtime = datetime.fromtimestamp(f.stat().st_mtime, tz=timezone.utc)
-        if mtime < target_start_utc - timedelta(days=1) or mtime > target_end_utc + timedelta(days=1):
+    # Sessions are append-only, so mtime bounds the last message; keep a day
+    # of slack on both sides and compare as epoch seconds.
+    mtime_min = (target_start_utc - timedelta(days=1)).timestamp()
+    mtime_max = (target_end_utc + timedelta(days=1)).timestamp()
+
+    candidates = []
+    for entry in _scan_session_files():
+        st = entry.stat()
+        if st.st_size < 2 or not mtime_min <= st.st_mtime <= mtime_max:
             continue
 
-        s = parse_session(f)
+        path = Path(entry.path)
+        is_hb, start, substantive = scan_session_header(path)
+        if start is not None and start.astimezone(LOCAL_TZ).date() != target.date():
+            continue
+        if is_hb and not substantive:
+            continue
+        candidates.append(path)
+
+    sessions = []
+    for s in _parse_sessions(candidates):
         if s["start_time"] is None:
             continue
         if s["start_time"].astimezone(LOCAL_TZ).date() != target.date():
@@ -156,12 +308,7 @@ def process_date(target_date: str):
 
         # Filter heartbeat noise
         is_hb = s["is_cron"] and "heartbeat" in s.get("cron_name", "").lower()
-        has_substance = any(
-            m["role"] == "assistant" and m["text"]
-            and m["text"] not in ("HEARTBEAT_OK", "NO_REPLY", "")
-            and not m["text"].startswith("<")
-            for m in s["messages"]
-        )
+        has_substance = any(_is_substantive(m["role"], m["text"]) for m in s["messages"])
         if is_hb and not has_substance:
             continue
 